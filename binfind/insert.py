@@ -1,11 +1,169 @@
+import bisect
 import math
 import os
-from typing import BinaryIO
+from typing import BinaryIO, Callable, Iterable
 
 import binfind.util
 from binfind import search
 
 
+def _key_fraction(key: bytes) -> float:
+    """
+    Place a key within the space of keys of its length.
+
+    Args:
+        key: Key to place.
+
+    Returns:
+        float: The position of the key between 0 and 1.
+    """
+
+    return int.from_bytes(key, "big") / (1 << (8 * len(key)))
+
+
+def _scan_window(
+        obj: BinaryIO,
+        key: bytes,
+        start_index: int,
+        end_index: int,
+        minimum_entry_size: int,
+        delimiter: bytes,
+) -> int:
+    """
+    Locate where a key belongs within a small range of a buffer.
+
+    The whole range is read at once and its entries are compared
+    in memory, which for a small range is cheaper than probing.
+
+    Args:
+        obj: Buffer capable of read operations.
+        key: Key to locate.
+        start_index: Offset within or at the end of an entry whose key
+            does not exceed our key, or 0 for the start of the buffer.
+        end_index: Offset of the entry the range ends before,
+            or the end of the buffer.
+        minimum_entry_size: Minimum length of entries in bytes.
+        delimiter: Delimiter between entries.
+
+    Returns:
+        int: Offset of the delimiter ending the last entry whose key
+            does not exceed our key, or 0 if our key belongs first.
+    """
+
+    obj.seek(start_index)
+    window: bytes = obj.read(max(end_index - start_index, 0))
+
+    if start_index == 0:
+        insertion_index: int = 0
+        entry_start: int = 0
+    else:
+        # Our range begins partway through an entry
+        # we know our key belongs after, so skip it.
+        insertion_index: int = window.find(delimiter)
+        if insertion_index == -1:
+            return end_index
+
+        entry_start: int = insertion_index + len(delimiter)
+
+    keys: list[bytes] = []
+    entry_ends: list[int] = []
+    while entry_start < len(window):
+        entry_end: int = window.find(delimiter, entry_start + minimum_entry_size)
+        if entry_end == -1:
+            entry_end: int = len(window)
+
+        keys.append(window[entry_start:entry_start + len(key)])
+        entry_ends.append(entry_end)
+        entry_start = entry_end + len(delimiter)
+
+    index: int = bisect.bisect_right(keys, key)
+    if index == 0:
+        return start_index + insertion_index
+
+    return start_index + entry_ends[index - 1]
+
+
+def _locate(
+        obj: BinaryIO,
+        key: bytes,
+        start_index: int,
+        end_index: int,
+        minimum_entry_size: int,
+        maximum_entry_size: int,
+        delimiter: bytes,
+        key_to_float: Callable[[bytes], float],
+        scratch: bytearray,
+) -> int:
+    """
+    Locate where a key belongs within a range of a buffer.
+
+    Args:
+        obj: Buffer capable of read operations.
+        key: Key to locate.
+        start_index: Offset within or at the end of an entry whose key
+            does not exceed our key, or 0 for the start of the buffer.
+        end_index: Offset of the entry the range ends before,
+            or the end of the buffer.
+        minimum_entry_size: Minimum length of entries in bytes.
+        maximum_entry_size: Maximum length of entries in bytes.
+        delimiter: Delimiter between entries.
+        key_to_float: Maps keys onto the range 0 to 1 in key order.
+        scratch: Buffer to read probes into, at least maximum_entry_size
+            plus the delimiter and key lengths.
+
+    Returns:
+        int: Offset of the delimiter ending the last entry whose key
+            does not exceed our key, or 0 if our key belongs first.
+    """
+
+    # Rather than always probing the midpoint, we estimate where our key
+    # lies from the keys bounding our range, which takes far fewer probes
+    # when keys are spread evenly. Should our estimates repeatedly fail to
+    # halve our range, the keys evidently are not, so we bisect from then
+    # on to bound the worst case.
+    target: float = key_to_float(key)
+    lower_bound: float = 0.0
+    upper_bound: float = 1.0
+    stalls: int = 0
+
+    while end_index - start_index >= 4 * maximum_entry_size:
+        width: int = end_index - start_index
+        interpolate: bool = stalls < 4 and lower_bound < upper_bound
+        if interpolate:
+            pivot: int = start_index + math.floor(width * (target - lower_bound) / (upper_bound - lower_bound))
+
+            # Probing at either boundary would only return the
+            # entries we have already compared against.
+            pivot: int = min(max(pivot, start_index + len(delimiter)), end_index - 1)
+        else:
+            pivot: int = math.floor((start_index + end_index) / 2)
+
+        # We only ever compare keys, so there is no need to read
+        # the rest of the entry. Where the entry's key does not
+        # exceed ours, neither does any key up to our pivot.
+        search_key, search_start = search.get_key_at(
+            obj, pivot, len(key),
+            maximum_entry_size=maximum_entry_size,
+            delimiter=delimiter,
+            scratch=scratch,
+        )
+
+        search_key: bytes = bytes(search_key)
+        if search_key > key:
+            end_index = search_start
+            upper_bound = key_to_float(search_key)
+        else:
+            start_index = pivot
+            lower_bound = key_to_float(search_key)
+
+        if interpolate and (end_index - start_index) * 2 > width:
+            stalls += 1
+
+    # Only a few entries remain in our range, so reading them in
+    # one go beats probing each of them individually.
+    return _scan_window(obj, key, start_index, end_index, minimum_entry_size, delimiter)
+
+
 def insert_fixed_key_entry(
         obj: BinaryIO,
         key: bytes,
@@ -16,6 +174,7 @@ def insert_fixed_key_entry(
         chunk_size: int = 1024 * 1024,
         start_index: int = 0,
         end_index: int | None = None,
+        key_to_float: Callable[[bytes], float] = _key_fraction,
 ):
     """
     Insert an entry into a buffer.
@@ -32,7 +191,9 @@ def insert_fixed_key_entry(
         delimiter: Delimiter between entries.
         chunk_size: Number of bytes to shift at a time.
         start_index: Offset to start searching at.
-        end_index: Offset to stop searching at.
+        end_index: Offset to stop searching at, which may fall within an entry.
+        key_to_float: Maps keys onto the range 0 to 1 in key order, used to
+            estimate where a key lies between two others.
 
     Returns:
 
@@ -64,22 +225,31 @@ def insert_fixed_key_entry(
 
         return start_index + len(delimiter), start_index + len(key) + len(value) + len(delimiter)
 
-    while start_index < end_index - len(delimiter):
-        search_value, search_start, search_end = search.get_entry_at(
-            obj, math.floor((start_index + end_index) / 2),
+    if end_index < obj_end_index:
+        # Our search takes the end of its range to be the end of an
+        # entry, so a range ending partway through one must extend
+        # to where that entry ends.
+        _, _, end_index = search.get_entry_at(
+            obj, end_index,
             minimum_entry_size=minimum_entry_size,
             maximum_entry_size=maximum_entry_size,
             delimiter=delimiter,
         )
 
-        search_key: bytes = search_value[:len(key)]
-        if search_key == key:
-            start_index: int = search_end
-            break
-        elif search_key > key:
-            end_index = search_start
-        else:
-            start_index = search_end
+    # Every probe reads into the same buffer rather than its own
+    scratch: bytearray = bytearray(maximum_entry_size + len(delimiter) + len(key))
+
+    # Probes land all over the buffer, so read-ahead
+    # would mostly fetch data we never look at.
+    binfind.util.advise(obj, "RANDOM")
+
+    try:
+        start_index: int = _locate(
+            obj, key, start_index, end_index,
+            minimum_entry_size, maximum_entry_size, delimiter, key_to_float, scratch,
+        )
+    finally:
+        binfind.util.advise(obj, "NORMAL")
 
     if start_index == 0:
         binfind.util.space(obj, offset=0, length=len(key) + len(value) + len(delimiter), chunk_size=chunk_size)
@@ -91,3 +261,118 @@ def insert_fixed_key_entry(
     obj.seek(start_index, os.SEEK_SET)
     obj.write(delimiter + key + value)
     return start_index + len(delimiter), start_index + len(key) + len(value) + len(delimiter)
+
+
+def insert_fixed_key_entries(
+        obj: BinaryIO,
+        entries: Iterable[tuple[bytes, bytes]],
+        minimum_entry_size: int | None = None,
+        maximum_entry_size: int = 128,
+        delimiter: bytes = b"\n",
+        chunk_size: int = 1024 * 1024,
+        key_to_float: Callable[[bytes], float] = _key_fraction,
+) -> list[tuple[int, int]]:
+    """
+    Insert many entries into a buffer at once.
+
+    This places entries as if each were inserted with
+    insert_fixed_key_entry, except that the content of the
+    buffer is shifted once for all of them rather than once
+    for each, which is far cheaper for large buffers.
+
+    Args:
+        obj: Buffer capable of read and write operations.
+        entries: Pairs of keys and values to insert.
+        minimum_entry_size: Minimum length of entries in bytes, used as a heuristic.
+        maximum_entry_size: Maximum length of entries in bytes, used as a heuristic.
+        delimiter: Delimiter between entries.
+        chunk_size: Number of bytes to shift at a time.
+        key_to_float: Maps keys onto the range 0 to 1 in key order, used to
+            estimate where a key lies between two others.
+
+    Returns:
+        list[tuple[int, int]]: The starting and ending byte index of
+            each inserted entry, in the order the entries were given.
+    """
+
+    entries: list[tuple[bytes, bytes]] = list(entries)
+    for key, value in entries:
+        if len(key) + len(value) > maximum_entry_size:
+            raise ValueError("The key length may not exceed the maximum entry size")
+
+    order: list[int] = sorted(range(len(entries)), key=lambda index: entries[index][0])
+    positions: list[tuple[int, int]] = [(0, 0)] * len(entries)
+    if not entries:
+        return positions
+
+    obj.seek(0, os.SEEK_END)
+    obj_end_index: int = obj.tell()
+
+    if obj_end_index == 0:
+        # The file is empty, so our entries make up all of it
+        position: int = 0
+        for index in order:
+            key, value = entries[index]
+            positions[index] = position, position + len(key) + len(value)
+            position += len(key) + len(value) + len(delimiter)
+
+        obj.seek(0, os.SEEK_SET)
+        obj.write(delimiter.join(entries[index][0] + entries[index][1] for index in order))
+        return positions
+
+    # Every probe reads into the same buffer rather than its own
+    scratch: bytearray = bytearray(maximum_entry_size + len(delimiter) + max(len(key) for key, _ in entries))
+
+    # Probes land all over the buffer, so read-ahead
+    # would mostly fetch data we never look at.
+    binfind.util.advise(obj, "RANDOM")
+
+    # As we locate our keys in order, each belongs no
+    # earlier than where the previous key belongs.
+    groups: list[tuple[int, list[int]]] = []
+    start_index: int = 0
+    try:
+        for index in order:
+            key: bytes = entries[index][0]
+            start_index: int = _locate(
+                obj, key, start_index, obj_end_index,
+                max(minimum_entry_size or 0, len(key)), maximum_entry_size, delimiter, key_to_float, scratch,
+            )
+
+            if groups and groups[-1][0] == start_index:
+                groups[-1][1].append(index)
+            else:
+                groups.append((start_index, [index]))
+    finally:
+        binfind.util.advise(obj, "NORMAL")
+
+    # Entries sharing a location are written together, and
+    # each location moves by everything inserted before it.
+    gaps: list[tuple[int, int]] = []
+    contents: list[tuple[int, bytes]] = []
+    shift: int = 0
+    for start_index, indexes in groups:
+        position: int = start_index + shift
+        parts: list[bytes] = []
+        for index in indexes:
+            key, value = entries[index]
+            if start_index == 0:
+                positions[index] = position, position + len(key) + len(value)
+                parts.append(key + value + delimiter)
+            else:
+                positions[index] = position + len(delimiter), position + len(delimiter) + len(key) + len(value)
+                parts.append(delimiter + key + value)
+
+            position += len(key) + len(value) + len(delimiter)
+
+        content: bytes = b"".join(parts)
+        gaps.append((start_index, len(content)))
+        contents.append((start_index + shift, content))
+        shift += len(content)
+
+    binfind.util.space_many(obj, gaps, chunk_size=chunk_size)
+    for position, content in contents:
+        obj.seek(position, os.SEEK_SET)
+        obj.write(content)
+
+    return positions
@@ -13,7 +13,8 @@ def get_entry(
         minimum_entry_size: int = 1,
         maximum_entry_size: int = 128,
         delimiter: bytes = b"\n",
-) -> tuple[bytes, int, int]:
+        scratch: bytearray | None = None,
+) -> tuple[bytes | memoryview, int, int]:
     """
     Find an entry at or after the given offset.
 
@@ -24,7 +25,9 @@ def get_entry(
     the beginning of the delimiter for an entry and is not 0,
     it will attempt to locate the next entry. The EOF is treated
     as if a delimiter. The minimum and maximum entry sizes are
-    not strictly enforced, but instead used as heuristics.
+    not strictly enforced, but instead used as heuristics. As
+    the first entry has no starting delimiter, it may run a
+    delimiter's length past the maximum entry size.
 
     Args:
         obj: A file-like object opened in binary mode.
@@ -32,76 +35,102 @@ def get_entry(
         minimum_entry_size: Minimum number of bytes an entry includes.
         maximum_entry_size: Maximum number of bytes an entry includes.
         delimiter: A single byte delimiter that delimits entries.
+        scratch: A buffer of at least twice maximum_entry_size plus three
+            times the delimiter length to read into, rather than allocating one.
 
     Returns:
-        tuple[bytes, int, int]: A tuple containing:
-            - The extracted entry as bytes (excluding delimiters).
+        tuple[bytes | memoryview, int, int]: A tuple containing:
+            - The extracted entry (excluding delimiters). This is a view
+              into scratch when provided, which the next use of scratch
+              overwrites.
             - The starting byte index of the entry within the file.
             - The ending byte index of the entry within the file.
 
     Raises:
         RuntimeError: If the starting or ending delimiter cannot
             be found within the read limits.
+        ValueError: If scratch is too small to read into.
     """
 
     # Jump to our offset
     obj.seek(offset)
 
-    # Get our initial line
-    initial_line: bytes = obj.read(maximum_entry_size + len(delimiter) * 2)
-    initial_line_length: int = len(initial_line)
+    # Get our initial line. Given scratch, we read into it so that
+    # we can search it in place, only copying out the entry if we
+    # must. Should we need to read further, that read lands right
+    # after our initial line, keeping the entry in one piece.
+    line_size: int = maximum_entry_size + len(delimiter) * 2
+    buffer_size: int = line_size + maximum_entry_size + len(delimiter)
+    if scratch is None:
+        line: bytes | bytearray = obj.read(line_size)
+        initial_line_length: int = len(line)
+    elif len(scratch) < buffer_size:
+        raise ValueError(f"Scratch buffer must hold at least {buffer_size!s} bytes")
+    else:
+        line: bytes | bytearray = scratch
+        initial_line_length: int = obj.readinto(memoryview(line)[:line_size])
 
     # Locate our starting delimiter. However, if our offset is 0,
     # we take it that we have already passed the delimiter.
     if offset == 0:
+        line_start: int = 0
         entry_start: int = 0
     else:
-        entry_start: int = initial_line.find(delimiter)
-        if entry_start == -1:
+        line_start: int = line.find(delimiter, 0, initial_line_length)
+        if line_start == -1:
             raise RuntimeError(f"Failed to locate entry start delimiter for offset {offset!s}")
 
-        # The content before our delimiter is not necessary, so remove it
-        initial_line = initial_line[entry_start + len(delimiter):]
-        entry_start: int = offset + entry_start + len(delimiter)
+        # The content before our delimiter is not necessary, so skip it
+        line_start += len(delimiter)
+        entry_start: int = offset + line_start
+
+    line_length: int = initial_line_length - line_start
 
     # As an optimization against having to read more from the object,
     # perhaps our ending delimiter is also present in our initial line?
-    entry_end: int = initial_line.find(delimiter, minimum_entry_size)
-    if entry_end != -1:
-        # We successfully found the ending delimiter from
-        # within our initial line, so we are done here!
-        return initial_line[:entry_end], entry_start, entry_start + entry_end
+    line_end: int = line.find(delimiter, line_start + minimum_entry_size, initial_line_length)
+    if line_end == -1 and initial_line_length == line_size:
+        # We already captured an initial segment of our data,
+        # so let's try not to read more than we have to here!
+        # We do not include the delimiter size here because
+        # our initial line read took care of those bytes.
+        ending_size: int = maximum_entry_size - line_length + len(delimiter)
+        if ending_size <= 0:
+            # Our initial line already holds as much as an entry may,
+            # so there is nothing more worth reading. This is always
+            # the case when the starting delimiter is at our offset.
+            raise RuntimeError(f"Failed to locate entry end delimiter for offset {offset!s}")
+
+        if scratch is None:
+            line += obj.read(ending_size)
+            ending_length: int = len(line) - initial_line_length
+        else:
+            ending_length: int = obj.readinto(memoryview(line)[initial_line_length:initial_line_length + ending_size])
+
+        # Our minimum entry size means that we might be able
+        # to skip over some bytes for finding the delimiter!
+        # However, some of our "minimum" bytes can be captured
+        # as part of our initial line read.
+        line_end: int = line.find(
+            delimiter, max(line_start + minimum_entry_size, initial_line_length), initial_line_length + ending_length)
 
-    if initial_line_length < maximum_entry_size + len(delimiter) * 2:
+        if line_end == -1:
+            if ending_length < ending_size:
+                # We failed to locate the ending delimiter; however,
+                # that is because we have encountered the end of the
+                # file, which we will treat as if the end instead.
+                line_end: int = initial_line_length + ending_length
+            else:
+                raise RuntimeError(f"Failed to locate entry end delimiter for offset {offset!s}")
+    elif line_end == -1:
         # We have encountered an end of file! This implies that what
         # we have so far is as much as we are going to get.
-        return initial_line, entry_start, entry_start + len(initial_line)
-
-    # We already captured an initial segment of our data,
-    # so let's try not to read more than we have to here!
-    # We do not include the delimiter size here because
-    # our initial line read took care of those bytes.
-    ending_line = obj.read(max(maximum_entry_size - len(initial_line) + len(delimiter), 0))
-
-    # Our minimum entry size means that we might be able
-    # to skip over some bytes for finding the delimiter!
-    # However, some of our "minimum" bytes can be captured
-    # as part of our initial line read.
-    entry_end: int = ending_line.find(
-        delimiter, max(minimum_entry_size - len(initial_line), 0))
-
-    if entry_end == -1:
-        if len(ending_line) < maximum_entry_size - len(initial_line) + len(delimiter):
-            # We failed to locate the ending delimiter; however,
-            # that is because we have encountered the end of the
-            # file, which we will treat as if the end instead.
-            combined_content: bytes = initial_line + ending_line
-            return combined_content, entry_start, entry_start + len(combined_content)
-        else:
-            raise RuntimeError(f"Failed to locate entry end delimiter for offset {offset!s}")
+        line_end: int = initial_line_length
+
+    if scratch is None:
+        return line[line_start:line_end], entry_start, entry_start + line_end - line_start
 
-    combined_content: bytes = initial_line + ending_line[:entry_end]
-    return combined_content, entry_start, entry_start + len(combined_content)
+    return memoryview(line)[line_start:line_end], entry_start, entry_start + line_end - line_start
 
 
 def get_entry_at(
@@ -109,15 +138,18 @@ def get_entry_at(
         offset: int,
         minimum_entry_size: int = 1,
         maximum_entry_size: int = 128,
-        delimiter: bytes = b"\n"
-) -> tuple[bytes, int, int]:
+        delimiter: bytes = b"\n",
+        scratch: bytearray | None = None,
+) -> tuple[bytes | memoryview, int, int]:
     """
     Find an entry containing a file offset
 
-    Do not use this function if an entry present at an exact offset
-    is not necessary as this will cause potentially many unnecessary
-    file reads to locate the desired entry. See get_entry. This
-    function is a wrapper around it to provide entries at exact offsets.
+    Unlike get_entry, which finds the entry following a delimiter,
+    this finds the entry that the offset itself falls within. Both
+    delimiters are searched for within a single read spanning the
+    furthest either could be from the offset. Entries are held to
+    the same maximum size as get_entry holds them to, including the
+    allowance it makes for the first entry.
 
     Args:
         obj: A file-like object opened in binary mode.
@@ -125,41 +157,136 @@ def get_entry_at(
         minimum_entry_size: Minimum number of bytes an entry includes.
         maximum_entry_size: Maximum number of bytes an entry includes.
         delimiter: A single byte delimiter that delimits entries.
+        scratch: A buffer of at least twice the sum of maximum_entry_size
+            and the delimiter length to read into, rather than allocating one.
 
     Returns:
-        tuple[bytes, int, int]: A tuple containing:
-            - The extracted entry as bytes (excluding delimiters).
+        tuple[bytes | memoryview, int, int]: A tuple containing:
+            - The extracted entry (excluding delimiters). This is a view
+              into scratch when provided, which the next use of scratch
+              overwrites.
             - The starting byte index of the entry within the file.
             - The ending byte index of the entry within the file.
 
     Raises:
         RuntimeError: If the starting or ending delimiter cannot
             be found within the read limits.
+        ValueError: If scratch is too small to read into.
+    """
+
+    # Our entry starts no further back than the longest entry
+    # could, and likewise ends no further ahead of our offset.
+    # The first entry may end a delimiter's length further.
+    read_start: int = max(offset - maximum_entry_size - len(delimiter), 0)
+    read_size: int = max(offset - read_start, len(delimiter)) + maximum_entry_size + len(delimiter)
+    if scratch is None:
+        line: bytearray = bytearray(read_size)
+    elif len(scratch) < read_size:
+        raise ValueError(f"Scratch buffer must hold at least {read_size!s} bytes")
+    else:
+        line: bytearray = scratch
+
+    obj.seek(read_start)
+    line_length: int = obj.readinto(memoryview(line)[:read_size])
+    line_offset: int = min(offset - read_start, line_length)
+
+    # The closest delimiter before our offset begins our entry. When our
+    # offset is the delimiter ending an entry, that entry is ours instead.
+    line_start: int = line.rfind(delimiter, 0, line_offset)
+    if line_start != -1:
+        line_start += len(delimiter)
+    elif read_start == 0:
+        # The start of the file is treated as if a delimiter
+        line_start: int = 0
+    else:
+        raise RuntimeError(f"Failed to locate entry start delimiter for offset {offset!s}")
+
+    line_end: int = line.find(delimiter, max(line_offset, line_start + minimum_entry_size), line_length)
+    if line_end == -1:
+        if line_length < read_size:
+            # We have encountered the end of the file,
+            # which we will treat as if the delimiter.
+            line_end: int = line_length
+        else:
+            raise RuntimeError(f"Failed to locate entry end delimiter for offset {offset!s}")
+
+    # Our read reaches past where an entry starting before our offset
+    # may end, so hold such entries to the same limit as get_entry,
+    # which allows the first entry the room its delimiter would take.
+    entry_limit: int = maximum_entry_size + len(delimiter)
+    if read_start + line_start == 0:
+        entry_limit += len(delimiter)
+
+    if line_end - line_start >= entry_limit:
+        raise RuntimeError(f"Failed to locate entry end delimiter for offset {offset!s}")
+
+    content: memoryview = memoryview(line)[line_start:line_end]
+    return content if scratch is not None else bytes(content), read_start + line_start, read_start + line_end
+
+
+def get_key_at(
+        obj: BinaryIO,
+        offset: int,
+        key_length: int,
+        maximum_entry_size: int = 128,
+        delimiter: bytes = b"\n",
+        scratch: bytearray | None = None,
+) -> tuple[bytes | memoryview, int]:
     """
+    Find the key of an entry containing a file offset
+
+    Where entries begin with a fixed length key, this provides
+    the same entry as get_entry_at while reading only as far as
+    the end of its key, as there is no need to locate the end of
+    the entry. The delimiter is assumed to not appear in keys.
+
+    Args:
+        obj: A file-like object opened in binary mode.
+        offset: Byte offset in the file to start searching.
+        key_length: Number of bytes keys include.
+        maximum_entry_size: Maximum number of bytes an entry includes.
+        delimiter: A single byte delimiter that delimits entries.
+        scratch: A buffer of at least maximum_entry_size plus the
+            delimiter and key lengths to read into, rather than
+            allocating one.
+
+    Returns:
+        tuple[bytes | memoryview, int]: A tuple containing:
+            - The key of the entry, which is shorter than the key length
+              only where the file ends first. This is a view into scratch
+              when provided, which the next use of scratch overwrites.
+            - The starting byte index of the entry within the file.
+
+    Raises:
+        RuntimeError: If the starting delimiter cannot be
+            found within the read limits.
+        ValueError: If scratch is too small to read into.
+    """
+
+    # Our entry starts no further back than the longest
+    # entry could, and its key ends shortly after our offset.
+    read_start: int = max(offset - maximum_entry_size - len(delimiter), 0)
+    read_size: int = offset - read_start + key_length
+    if scratch is None:
+        line: bytearray = bytearray(read_size)
+    elif len(scratch) < read_size:
+        raise ValueError(f"Scratch buffer must hold at least {read_size!s} bytes")
+    else:
+        line: bytearray = scratch
+
+    obj.seek(read_start)
+    line_length: int = obj.readinto(memoryview(line)[:read_size])
+
+    # The closest delimiter before our offset begins our entry. When our
+    # offset is the delimiter ending an entry, that entry is ours instead.
+    key_start: int = line.rfind(delimiter, 0, min(offset - read_start, line_length))
+    if key_start != -1:
+        key_start += len(delimiter)
+    elif read_start == 0:
+        # The start of the file is treated as if a delimiter
+        key_start: int = 0
+    else:
+        raise RuntimeError(f"Failed to locate entry start delimiter for offset {offset!s}")
 
-    # The get_entry function returns an entry where the
-    # delimiter starts at the offset or later, whereas
-    # in this case, we desire the entry that exists at
-    # an index. As a result, we retrieve an initial
-    # entry based on our available heuristics and
-    # "walk up" to our true desired entry.
-    # fmt: off
-    initial_content, initial_start, initial_end = get_entry(
-        obj, max(offset - maximum_entry_size - len(delimiter), 0),
-        minimum_entry_size, maximum_entry_size, delimiter
-    )
-
-    # Check if our initial entry is our desired entry
-    if initial_start <= offset <= initial_end:
-        return initial_content, initial_start, initial_end
-
-    # We have now established a baseline! Time to "walk up"
-    # to our desired entry given our starting point.
-    while True:
-        # fmt: off
-        initial_content, initial_start, initial_end = get_entry(
-            obj, initial_end, minimum_entry_size, maximum_entry_size, delimiter
-        )
-
-        if initial_start <= offset <= initial_end:
-            return initial_content, initial_start, initial_end
+    content: memoryview = memoryview(line)[key_start:min(key_start + key_length, line_length)]
+    return content if scratch is not None else bytes(content), read_start + key_start
@@ -1,20 +1,298 @@
+import ctypes
+import ctypes.util
+import errno
+import functools
+import io
 import os
-from typing import BinaryIO
+import sys
+from typing import BinaryIO, Callable
 
+# Linux fallocate mode which inserts a hole, shifting the data after it
+_FALLOC_FL_INSERT_RANGE: int = 0x20
 
-def space(obj: BinaryIO, offset: int, length: int, chunk_size: int = 1024 * 1024):
-    obj.seek(0, os.SEEK_END)
-    end_position: int = obj.tell()
+# Smallest unit any filesystem block size is a multiple of
+_SECTOR_SIZE: int = 512
 
-    if offset == end_position:
+
+def _fileno(obj: BinaryIO) -> int | None:
+    """
+    Retrieve the file descriptor backing a file-like object.
+
+    Args:
+        obj: A file-like object opened in binary mode.
+
+    Returns:
+        int | None: The file descriptor, or None if the object
+            is not backed by one, such as with io.BytesIO.
+    """
+
+    try:
+        return obj.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        return None
+
+
+def advise(obj: BinaryIO, advice: str, offset: int = 0, length: int = 0):
+    """
+    Declare how a range of a file-like object is about to be accessed.
+
+    This lets the kernel tune its read-ahead and caching for the range.
+    It does nothing for objects that are not backed by a file descriptor
+    or on platforms without posix_fadvise.
+
+    Args:
+        obj: A file-like object opened in binary mode.
+        advice: Name of the advice without its prefix, such as "RANDOM"
+            for POSIX_FADV_RANDOM.
+        offset: Offset the range begins at.
+        length: Length of the range, or 0 for through the end of the file.
+    """
+
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    fd: int | None = _fileno(obj)
+    if fd is None:
         return
 
-    # Shift the data
+    try:
+        os.posix_fadvise(fd, offset, length, getattr(os, f"POSIX_FADV_{advice}"))
+    except OSError:
+        # Advice is only ever a hint, so it is not worth failing over.
+        pass
+
+
+@functools.cache
+def _load_fallocate() -> Callable[[int, int, int, int], int] | None:
+    """
+    Load fallocate from the C library.
+
+    Returns:
+        Callable[[int, int, int, int], int] | None: The fallocate
+            function, or None if it is unavailable.
+    """
+
+    if not sys.platform.startswith("linux"):
+        return None
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fallocate = libc.fallocate64
+    except (OSError, AttributeError):
+        return None
+
+    fallocate.argtypes = (ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64)
+    fallocate.restype = ctypes.c_int
+    return fallocate
+
+
+def _shift_inserted(fd: int, offset: int, length: int) -> bool:
+    """
+    Shift the tail of a file by inserting a hole before it.
+
+    The filesystem only remaps the blocks making up the tail, so no
+    data is copied at all. This requires both the offset and length
+    to be multiples of the filesystem block size, and a filesystem
+    which supports it, such as ext4 or XFS.
+
+    Args:
+        fd: File descriptor opened for writing.
+        offset: Offset of the first byte to shift.
+        length: Number of bytes to shift the tail by.
+
+    Returns:
+        bool: Whether the tail was shifted.
+
+    Raises:
+        OSError: If the filesystem fails to insert the hole.
+    """
+
+    # Block sizes are all multiples of a sector, so most shifts can be
+    # ruled out without the system call to look up the block size.
+    if offset % _SECTOR_SIZE or length % _SECTOR_SIZE:
+        return False
+
+    block_size: int = os.fstatvfs(fd).f_bsize
+    if offset % block_size or length % block_size:
+        return False
+
+    fallocate = _load_fallocate()
+    if fallocate is None:
+        return False
+
+    if fallocate(fd, _FALLOC_FL_INSERT_RANGE, offset, length) == 0:
+        return True
+
+    error: int = ctypes.get_errno()
+    if error in (errno.EOPNOTSUPP, errno.EINVAL, errno.ENOSYS):
+        return False
+
+    raise OSError(error, os.strerror(error))
+
+
+def _shift_buffered(obj: BinaryIO, offset: int, end_position: int, length: int, chunk_size: int):
+    """
+    Shift the tail of an object through its own read and write calls.
+
+    Args:
+        obj: Buffer capable of read and write operations.
+        offset: Offset of the first byte to shift.
+        end_position: Offset of the end of the object.
+        length: Number of bytes to shift the tail by.
+        chunk_size: Number of bytes to shift at a time.
+    """
+
     for pos in range(end_position, offset, -chunk_size):
         read_start = max(offset, pos - chunk_size)
 
         obj.seek(read_start)
-        chunk = obj.read(min(chunk_size, end_position - read_start))
+        chunk = obj.read(pos - read_start)
 
         obj.seek(read_start + length)
         obj.write(memoryview(chunk))
+
+
+def _shift_descriptor(fd: int, offset: int, end_position: int, length: int, chunk_size: int):
+    """
+    Shift the tail of a file using positional reads and writes.
+
+    Positional calls carry their offset with them, which saves a
+    seek for every read and write that the buffered path makes.
+
+    Args:
+        fd: File descriptor opened for reading and writing.
+        offset: Offset of the first byte to shift.
+        end_position: Offset of the end of the file.
+        length: Number of bytes to shift the tail by.
+        chunk_size: Number of bytes to shift at a time.
+    """
+
+    for pos in range(end_position, offset, -chunk_size):
+        read_start = max(offset, pos - chunk_size)
+        os.pwrite(fd, os.pread(fd, pos - read_start, read_start), read_start + length)
+
+
+def _grow(fd: int, end_position: int, length: int):
+    """
+    Extend a file in preparation for shifting its content.
+
+    Args:
+        fd: File descriptor opened for writing.
+        end_position: Offset of the end of the file.
+        length: Number of bytes to extend the file by.
+    """
+
+    # Reserve the blocks our tail will grow into ahead of time so
+    # the filesystem can allocate them contiguously rather than
+    # piecemeal as each chunk is written past the end of the file.
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, end_position, length)
+        except OSError:
+            # Not every filesystem supports preallocation, but
+            # it is only an optimization, so carry on without.
+            pass
+
+    os.ftruncate(fd, end_position + length)
+
+
+def space(obj: BinaryIO, offset: int, length: int, chunk_size: int = 1024 * 1024):
+    obj.seek(0, os.SEEK_END)
+    end_position: int = obj.tell()
+
+    if offset == end_position:
+        return
+
+    fd: int | None = _fileno(obj)
+    if fd is None or not hasattr(os, "pwrite"):
+        _shift_buffered(obj, offset, end_position, length, chunk_size)
+        return
+
+    # We are about to work with the file descriptor directly,
+    # so anything still sitting in the buffer must land first.
+    obj.flush()
+
+    if _shift_inserted(fd, offset, length):
+        obj.flush()
+        return
+
+    _grow(fd, end_position, length)
+
+    # The shift reads the tail in large contiguous chunks,
+    # so read-ahead can be more aggressive than usual.
+    advise(obj, "SEQUENTIAL", offset, end_position - offset)
+
+    try:
+        _shift_descriptor(fd, offset, end_position, length, chunk_size)
+    finally:
+        advise(obj, "NORMAL", offset, end_position - offset)
+
+    # Whatever the buffer read ahead before the shift is now stale,
+    # and flushing a readable buffer discards it.
+    obj.flush()
+
+
+def space_many(obj: BinaryIO, gaps: list[tuple[int, int]], chunk_size: int = 1024 * 1024):
+    """
+    Open several gaps within a buffer in a single pass.
+
+    Calling space for each gap in turn would shift the tail once per
+    gap. Instead, we work back from the end of the buffer, shifting
+    each range between two gaps by the total length of the gaps
+    before it, such that every byte only moves once.
+
+    Args:
+        obj: Buffer capable of read and write operations.
+        gaps: Pairs of the offset to open a gap at and its length, in
+            ascending order of offset with no offset appearing twice.
+            Offsets are those before any of the gaps are opened.
+        chunk_size: Number of bytes to shift at a time.
+    """
+
+    obj.seek(0, os.SEEK_END)
+    end_position: int = obj.tell()
+
+    # As with space, a gap at the end of the buffer needs no room made
+    gaps: list[tuple[int, int]] = [gap for gap in gaps if gap[0] != end_position]
+    if not gaps:
+        return
+
+    if len(gaps) == 1:
+        space(obj, gaps[0][0], gaps[0][1], chunk_size=chunk_size)
+        return
+
+    # Each range runs from one gap to the next, or to the end of
+    # the buffer, and moves by the lengths of the gaps up to it.
+    ranges: list[tuple[int, int, int]] = []
+    distance: int = sum(length for _, length in gaps)
+    range_end: int = end_position
+    for offset, length in reversed(gaps):
+        ranges.append((offset, range_end, distance))
+        distance -= length
+        range_end = offset
+
+    fd: int | None = _fileno(obj)
+    if fd is None or not hasattr(os, "pwrite"):
+        for offset, range_end, distance in ranges:
+            _shift_buffered(obj, offset, range_end, distance, chunk_size)
+
+        return
+
+    # We are about to work with the file descriptor directly,
+    # so anything still sitting in the buffer must land first.
+    obj.flush()
+
+    _grow(fd, end_position, ranges[0][2])
+
+    # Our ranges together make up the tail from the first gap onwards
+    advise(obj, "SEQUENTIAL", gaps[0][0], end_position - gaps[0][0])
+
+    try:
+        for offset, range_end, distance in ranges:
+            _shift_descriptor(fd, offset, range_end, distance, chunk_size)
+    finally:
+        advise(obj, "NORMAL", gaps[0][0], end_position - gaps[0][0])
+
+    # Whatever the buffer read ahead before the shift is now stale,
+    # and flushing a readable buffer discards it.
+    obj.flush()
@@ -0,0 +1,126 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+from typing import BinaryIO
+
+from binfind import insert
+
+
+class InsertFixedKeyEntriesTest(unittest.TestCase):
+    def open_buffers(self, content: bytes) -> list[BinaryIO]:
+        """
+        Provide the same content both in memory and within a real file.
+
+        Args:
+            content: Initial content of each buffer.
+
+        Returns:
+            list[BinaryIO]: An in-memory buffer and a file buffer.
+        """
+
+        fd, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, "wb") as file:
+            file.write(content)
+
+        file: BinaryIO = open(path, "r+b")
+        self.addCleanup(file.close)
+        return [io.BytesIO(content), file]
+
+    def check_insert(self, content: bytes, entries: list[tuple[bytes, bytes]], **kwargs):
+        """
+        Insert entries in one go and compare against inserting them one by one.
+
+        Args:
+            content: Initial content of the buffer.
+            entries: Pairs of keys and values to insert.
+            **kwargs: Options passed to both insertion functions.
+        """
+
+        expected_buffer: BinaryIO = io.BytesIO(content)
+        for key, value in entries:
+            insert.insert_fixed_key_entry(expected_buffer, key, value, **kwargs)
+
+        expected: bytes = expected_buffer.getvalue()
+
+        for obj in self.open_buffers(content):
+            with self.subTest(buffer=type(obj).__name__):
+                positions = insert.insert_fixed_key_entries(obj, entries, **kwargs)
+
+                obj.seek(0, os.SEEK_SET)
+                result: bytes = obj.read()
+                self.assertEqual(expected, result)
+
+                self.assertEqual(len(entries), len(positions))
+                for (key, value), (start, end) in zip(entries, positions):
+                    self.assertEqual(key + value, result[start:end])
+
+    def test_empty_file(self):
+        self.check_insert(b"", [(b"k3", b":c"), (b"k1", b":a"), (b"k2", b":b")])
+
+    def test_before_first_entry(self):
+        self.check_insert(b"m1:a\nm2:b\nm3:c", [(b"a2", b":y"), (b"a1", b":x")])
+
+    def test_end_of_file(self):
+        self.check_insert(b"m1:a\nm2:b\nm3:c", [(b"z1", b":x"), (b"y1", b":y")])
+
+    def test_duplicate_keys(self):
+        self.check_insert(
+            b"m1:a\nm2:b\nm3:c",
+            [(b"m2", b":x"), (b"m2", b":y"), (b"m1", b":z"), (b"m4", b":w"), (b"m4", b":v")],
+        )
+
+    def test_no_entries(self):
+        for obj in self.open_buffers(b"m1:a"):
+            with self.subTest(buffer=type(obj).__name__):
+                self.assertEqual([], insert.insert_fixed_key_entries(obj, []))
+
+                obj.seek(0, os.SEEK_SET)
+                self.assertEqual(b"m1:a", obj.read())
+
+    def test_random_entries(self):
+        rng: random.Random = random.Random(0)
+        keys: list[bytes] = sorted(rng.randbytes(4).hex().encode() for _ in range(200))
+        content: bytes = b"\n".join(key + b":" + b"x" * rng.randint(0, 40) for key in keys)
+
+        # Some new keys repeat those already present
+        entries: list[tuple[bytes, bytes]] = []
+        for _ in range(50):
+            key: bytes = rng.choice(keys) if rng.random() < 0.2 else rng.randbytes(4).hex().encode()
+            entries.append((key, b":" + b"y" * rng.randint(0, 40)))
+
+        # A small chunk size moves each range in several steps
+        self.check_insert(content, entries, maximum_entry_size=64, chunk_size=37)
+
+
+class InsertFixedKeyEntryTest(unittest.TestCase):
+    def test_search_hints(self):
+        rng: random.Random = random.Random(0)
+        entries: list[bytes] = [b"%02d:" % index + b"x" * rng.randint(0, 8) for index in range(0, 60, 2)]
+        content: bytes = b"\n".join(entries)
+
+        # Small entries make the hinted ranges wide enough to probe
+        for key in (b"00", b"01", b"31", b"58", b"59"):
+            expected_entries: list[bytes] = sorted(entries + [key + b":N"], key=lambda entry: entry[:2])
+            expected: bytes = b"\n".join(expected_entries)
+
+            # Our entry belongs at the delimiter ending the entry before it,
+            # and hints are valid so long as they do not exclude that spot.
+            location: int = max(expected.index(key + b":N") - 1, 0)
+            delimiters: list[int] = [index for index in range(location + 1) if content[index:index + 1] == b"\n"]
+            for start_index in [0] + delimiters:
+                for end_index in range(location, len(content) + 1):
+                    with self.subTest(key=key, start_index=start_index, end_index=end_index):
+                        obj: io.BytesIO = io.BytesIO(content)
+                        start, end = insert.insert_fixed_key_entry(
+                            obj, key, b":N", maximum_entry_size=16, start_index=start_index, end_index=end_index,
+                        )
+
+                        self.assertEqual(expected, obj.getvalue())
+                        self.assertEqual(key + b":N", expected[start:end])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import io
+import unittest
+
+from binfind import search
+
+TABLES: list[bytes] = [
+    b"a1:x\nb1:yyyy\nc1:z\nd1:qq",
+    b"a1:x\nb1:yyyy\nc1:z\nd1:qq\n",
+    b"a1:xxxxxxxxxx",
+]
+
+
+def entry_containing(content: bytes, offset: int, delimiter: bytes = b"\n") -> tuple[bytes, int, int]:
+    """
+    Find the entry containing an offset by scanning the whole table.
+
+    Args:
+        content: Table to search.
+        offset: Offset within the table.
+        delimiter: Delimiter between entries.
+
+    Returns:
+        tuple[bytes, int, int]: The entry and its starting and ending offsets.
+    """
+
+    start: int = content.rfind(delimiter, 0, offset)
+    start: int = 0 if start == -1 else start + len(delimiter)
+
+    end: int = content.find(delimiter, offset)
+    if end == -1:
+        end: int = len(content)
+
+    return content[start:end], start, end
+
+
+class GetEntryAtTest(unittest.TestCase):
+    def test_every_offset(self):
+        for content in TABLES:
+            for offset in range(len(content) + 1):
+                with self.subTest(content=content, offset=offset):
+                    expected: tuple[bytes, int, int] = entry_containing(content, offset)
+                    self.assertEqual(expected, search.get_entry_at(io.BytesIO(content), offset, maximum_entry_size=16))
+
+                    entry, start, end = search.get_entry_at(
+                        io.BytesIO(content), offset, maximum_entry_size=16, scratch=bytearray(64),
+                    )
+                    self.assertEqual(expected, (bytes(entry), start, end))
+
+    def test_offset_on_delimiter(self):
+        # The delimiter belongs to the entry it ends
+        self.assertEqual((b"b1:yyyy", 5, 12), search.get_entry_at(io.BytesIO(TABLES[0]), 12))
+
+    def test_offset_zero(self):
+        self.assertEqual((b"a1:x", 0, 4), search.get_entry_at(io.BytesIO(TABLES[0]), 0))
+
+    def test_end_of_file(self):
+        content: bytes = TABLES[0]
+        self.assertEqual((b"d1:qq", 18, 23), search.get_entry_at(io.BytesIO(content), len(content)))
+
+        # Past a trailing delimiter, there is only an empty entry left
+        content: bytes = TABLES[1]
+        self.assertEqual((b"", 24, 24), search.get_entry_at(io.BytesIO(content), len(content)))
+
+    def test_oversized_entry(self):
+        content: bytes = b"a1:x\n" + b"b" * 20 + b"\nc1:z"
+        for offset in range(6, 25):
+            with self.subTest(offset=offset):
+                with self.assertRaises(RuntimeError):
+                    search.get_entry_at(io.BytesIO(content), offset, maximum_entry_size=8)
+
+    def test_first_entry_size(self):
+        # Lacking a starting delimiter, the first entry may take its place
+        content: bytes = b"x" * 8 + b"\nyy"
+        self.assertEqual((b"x" * 8, 0, 8), search.get_entry(io.BytesIO(content), 0, maximum_entry_size=7))
+        for offset in range(9):
+            with self.subTest(offset=offset):
+                self.assertEqual(
+                    (b"x" * 8, 0, 8), search.get_entry_at(io.BytesIO(content), offset, maximum_entry_size=7),
+                )
+
+        content: bytes = b"x" * 9 + b"\nyy"
+        with self.assertRaises(RuntimeError):
+            search.get_entry(io.BytesIO(content), 0, maximum_entry_size=7)
+
+        for offset in range(10):
+            with self.subTest(offset=offset):
+                with self.assertRaises(RuntimeError):
+                    search.get_entry_at(io.BytesIO(content), offset, maximum_entry_size=7)
+
+    def test_scratch_too_small(self):
+        with self.assertRaises(ValueError):
+            search.get_entry_at(io.BytesIO(TABLES[0]), 12, maximum_entry_size=16, scratch=bytearray(8))
+
+
+class GetKeyAtTest(unittest.TestCase):
+    def test_every_offset(self):
+        for content in TABLES:
+            for offset in range(len(content) + 1):
+                with self.subTest(content=content, offset=offset):
+                    entry, start, _ = entry_containing(content, offset)
+                    self.assertEqual((entry[:2], start), search.get_key_at(io.BytesIO(content), offset, 2))
+
+                    key, key_start = search.get_key_at(io.BytesIO(content), offset, 2, scratch=bytearray(64))
+                    self.assertEqual((entry[:2], start), (bytes(key), key_start))
+
+    def test_matches_get_entry_at(self):
+        for content in TABLES:
+            for offset in range(len(content) + 1):
+                with self.subTest(content=content, offset=offset):
+                    entry, start, _ = search.get_entry_at(io.BytesIO(content), offset, maximum_entry_size=16)
+                    key, key_start = search.get_key_at(io.BytesIO(content), offset, 3, maximum_entry_size=16)
+                    self.assertEqual((entry[:3], start), (key, key_start))
+
+    def test_key_cut_short(self):
+        # Only so much of a key as the file holds is returned
+        self.assertEqual((b"c", 5), search.get_key_at(io.BytesIO(b"a1:x\nc"), 5, 2))
+
+    def test_scratch_too_small(self):
+        with self.assertRaises(ValueError):
+            search.get_key_at(io.BytesIO(TABLES[0]), 12, 2, scratch=bytearray(8))
+
+
+if __name__ == "__main__":
+    unittest.main()